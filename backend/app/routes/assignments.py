@@ -1,78 +1,104 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
 from app.supabase_client import (
-    insert_data, get_data, update_data, delete_data,
-    get_paginated_data, get_assignments_with_details
+    ainsert_data, aget_data, aupdate_data, adelete_data,
+    aget_assignments_with_details, aexecute_rpc
 )
 from app.schemas import (
     AssignmentCreate, AssignmentResponse, AssignmentUpdate,
     AssignmentListResponse, PaginationResponse, BaseResponse,
-    BulkAssignRequest, BulkOperationResponse, EscalationRequest
+    BulkAssignRequest, BulkOperationResponse, EscalationRequest,
+    WorkloadResponse, DepartmentAssignmentStatsResponse, MAX_BULK_ASSIGN
 )
 from app.routes.auth import get_current_user, require_roles
 from app.services.notification_service import NotificationService
-from typing import List, Optional, Literal
+from app.services.profile_service import ProfileService
+from typing import Dict, List, Optional, Literal, Tuple
+import asyncio
+import hashlib
+import heapq
 import logging
-import math
+import orjson
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Assignment row with staff, assigner and issue details embedded
+ASSIGNMENT_SELECT = (
+    "*,"
+    "staff:profiles!staff_id(full_name,department,role),"
+    "assigned_by_profile:profiles!assigned_by(full_name),"
+    "issues!issue_id(title,category)"
+)
+
 
 def _process_assignment_data(assignment_data: dict) -> dict:
     """Process raw assignment data to include additional fields."""
     # Handle staff profile data (now includes supervisors too)
-    if assignment_data.get("staff"):
-        staff_profile = assignment_data["staff"]
+    if staff_profile := assignment_data.pop("staff", None):
         assignment_data["staff_name"] = staff_profile.get("full_name")
         assignment_data["staff_department"] = staff_profile.get("department")
         assignment_data["staff_role"] = staff_profile.get("role")  # Include role
-        del assignment_data["staff"]
     
     # Handle assigned_by profile data
-    if assignment_data.get("assigned_by_profile"):
-        assignment_data["assigned_by_name"] = assignment_data["assigned_by_profile"].get("full_name")
-        del assignment_data["assigned_by_profile"]
+    if assigned_by_profile := assignment_data.pop("assigned_by_profile", None):
+        assignment_data["assigned_by_name"] = assigned_by_profile.get("full_name")
     
     # Handle issue data
-    if assignment_data.get("issues"):
-        issue_data = assignment_data["issues"]
+    if issue_data := assignment_data.pop("issues", None):
         assignment_data["issue_title"] = issue_data.get("title")
         assignment_data["issue_category"] = issue_data.get("category")
-        del assignment_data["issues"]
     
     return assignment_data
 
 
+# SLA hours keyed by (category, priority)
+_SLA_HOURS = {
+    ("potholes", "low"): 168, ("potholes", "medium"): 72, ("potholes", "high"): 24, ("potholes", "urgent"): 4,
+    ("Garbage", "low"): 48, ("Garbage", "medium"): 24, ("Garbage", "high"): 8, ("Garbage", "urgent"): 2,
+    ("WaterLogging", "low"): 72, ("WaterLogging", "medium"): 48, ("WaterLogging", "high"): 12, ("WaterLogging", "urgent"): 4,
+    ("DamagedElectricalPoles", "low"): 120, ("DamagedElectricalPoles", "medium"): 72,
+    ("DamagedElectricalPoles", "high"): 24, ("DamagedElectricalPoles", "urgent"): 8,
+    ("FallenTrees", "low"): 168, ("FallenTrees", "medium"): 96, ("FallenTrees", "high"): 48, ("FallenTrees", "urgent"): 12,
+}
+
+
 def calculate_deadline(category: str, priority: str = "medium") -> datetime:
     """Calculate deadline based on category and priority."""
-    sla_hours = {
-        "potholes": {"low": 168, "medium": 72, "high": 24, "urgent": 4},
-        "Garbage": {"low": 48, "medium": 24, "high": 8, "urgent": 2},
-        "WaterLogging": {"low": 72, "medium": 48, "high": 12, "urgent": 4},
-        "DamagedElectricalPoles": {"low": 120, "medium": 72, "high": 24, "urgent": 8},
-        "FallenTrees": {"low": 168, "medium": 96, "high": 48, "urgent": 12}
-    }
-    
-    hours = sla_hours.get(category, {}).get(priority, 72)
+    hours = _SLA_HOURS.get((category, priority), 72)
     return datetime.now() + timedelta(hours=hours)
 
 
 @router.post("/", response_model=AssignmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_assignment(
     assignment: AssignmentCreate,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(require_roles(["admin", "supervisor", "staff"]))
 ):
     """Create a new assignment (admin/supervisor/staff). Can assign to staff or supervisors."""
     try:
-        user_role = current_user["profile"]["role"]
-        user_id = current_user["profile"]["id"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_id = profile["id"]
+        user_department = profile.get("department")
         
         logger.info(f"Creating assignment - User: {user_id}, Role: {user_role}")
         logger.info(f"Assignment data: issue_id={assignment.issue_id}, staff_id={assignment.staff_id}")
         
+        # Fetch issue, assignee and any duplicate active assignment concurrently
+        issues, assignee, existing_assignments = await asyncio.gather(
+            aget_data("issues", {"id": assignment.issue_id}),
+            aget_data("profiles", {"id": assignment.staff_id}),
+            aget_data("issue_assignments", {
+                "issue_id": assignment.issue_id,
+                "staff_id": assignment.staff_id,
+                "status": ["assigned", "in_progress"]
+            }, select_fields="id", limit=1)
+        )
+        
         # Check if issue exists
-        issues = get_data("issues", {"id": assignment.issue_id})
         if not issues:
             logger.error(f"Issue {assignment.issue_id} not found")
             raise HTTPException(
@@ -84,7 +110,6 @@ async def create_assignment(
         logger.info(f"Issue found: {issue.get('title')}")
         
         # Check if assignee exists
-        assignee = get_data("profiles", {"id": assignment.staff_id})
         if not assignee:
             logger.error(f"Assignee {assignment.staff_id} not found")
             raise HTTPException(
@@ -119,7 +144,6 @@ async def create_assignment(
                 )
             
             # Staff can only assign to supervisors in their own department
-            user_department = current_user["profile"].get("department")
             assignee_department = assignee_profile.get("department")
             
             logger.info(f"Department check - User: {user_department}, Assignee: {assignee_department}")
@@ -133,7 +157,6 @@ async def create_assignment(
         
         # Check department permissions for supervisors
         if user_role == "supervisor":
-            user_department = current_user["profile"].get("department")
             assignee_department = assignee_profile.get("department")
             
             if user_department != assignee_department:
@@ -144,12 +167,6 @@ async def create_assignment(
                 )
         
         # Check if issue is already assigned to the same person
-        existing_assignments = get_data("issue_assignments", {
-            "issue_id": assignment.issue_id,
-            "staff_id": assignment.staff_id,
-            "status": ["assigned", "in_progress"]
-        })
-        
         if existing_assignments:
             logger.warning(f"Issue {assignment.issue_id} already assigned to {assignment.staff_id}")
             raise HTTPException(
@@ -163,8 +180,12 @@ async def create_assignment(
         
         logger.info(f"Creating assignment in database: {assignment_data}")
         
-        # Create assignment
-        result = insert_data("issue_assignments", assignment_data)
+        # Create assignment and return it with related data
+        result = await ainsert_data(
+            "issue_assignments",
+            assignment_data,
+            select_fields=ASSIGNMENT_SELECT
+        )
         if not result:
             logger.error("Failed to insert assignment into database")
             raise HTTPException(
@@ -176,43 +197,20 @@ async def create_assignment(
         
         # Update issue status to in_progress if it was pending
         if issue["status"] == "pending":
-            update_data("issues", {"id": assignment.issue_id}, {"status": "in_progress"})
+            await aupdate_data("issues", {"id": assignment.issue_id}, {"status": "in_progress"})
             logger.info(f"Updated issue {assignment.issue_id} status to in_progress")
         
-        # Get the created assignment with related data
-        created_assignment = get_data(
-            "issue_assignments",
-            {"id": result[0]["id"]},
-            select_fields="""
-            *, 
-            staff:profiles!staff_id(full_name, department, role),
-            assigned_by_profile:profiles!assigned_by(full_name),
-            issues!issue_id(title, category)
-            """
-        )
-        
-        if not created_assignment:
-            logger.error("Failed to retrieve created assignment")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve created assignment"
-            )
-        
-        assignment_with_details = _process_assignment_data(created_assignment[0])
+        assignment_with_details = _process_assignment_data(result[0])
         
         logger.info(f"Assignment created: Issue {assignment.issue_id} assigned to {assignee_role} {assignment.staff_id}")
         
-        # Send notification to assignee
-        try:
-            notification_service = NotificationService()
-            await notification_service.notify_assignment_created(
-                assignee_id=assignment.staff_id,
-                issue_id=assignment.issue_id,
-                assigned_by=user_id
-            )
-            logger.info("Notification sent successfully")
-        except Exception as e:
-            logger.warning(f"Failed to send notification: {str(e)}")
+        # Notify assignee after the response is sent
+        background_tasks.add_task(
+            NotificationService.notify_assignment_created,
+            assignee_id=assignment.staff_id,
+            issue_id=assignment.issue_id,
+            assigned_by=user_id
+        )
         
         return AssignmentResponse(**assignment_with_details)
         
@@ -244,7 +242,7 @@ async def escalate_assignment(
         )
     
     # Get assignment
-    assignment = get_data("issue_assignments", {"id": assignment_id})
+    assignment = await aget_data("issue_assignments", {"id": assignment_id}, select_fields="id")
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -253,13 +251,56 @@ async def escalate_assignment(
     
     # Update assignment with new deadline
     new_deadline = datetime.now() + timedelta(hours=24)  # 24 hour extension
-    update_data("issue_assignments", 
+    await aupdate_data("issue_assignments", 
                 {"id": assignment_id}, 
                 {"deadline": new_deadline, "notes": f"Escalated: {escalation.reason}"})
     
     return BaseResponse(success=True, message="Assignment escalated successfully")
 
 
+def _assignment_etag(assignment: dict) -> str:
+    """Weak ETag derived from the fetched assignment row (including embedded details)."""
+    digest = hashlib.blake2b(
+        orjson.dumps(assignment, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+    return f'W/"{assignment["id"]}-{digest}"'
+
+
+def _build_list_filters(current_user: dict, staff_id: Optional[str], issue_id: Optional[int],
+                        status_filter: Optional[str], department: Optional[str]) -> Optional[Tuple[dict, Optional[str]]]:
+    """Build assignment list filters and the staff department to restrict to, based on role.
+
+    Returns None when the user can't see any assignments (a supervisor with no department).
+    """
+    filters = {}
+    staff_department = None
+    profile = current_user["profile"]
+    user_role = profile["role"]
+    
+    # Role-based filtering
+    if user_role == "staff":
+        filters["staff_id"] = profile["id"]
+    elif user_role == "supervisor":
+        # Supervisors can see assignments for themselves AND their department staff
+        staff_department = profile.get("department")
+        if not staff_department:
+            return None
+    elif staff_id:
+        filters["staff_id"] = staff_id
+    
+    # Apply other filters
+    if issue_id:
+        filters["issue_id"] = issue_id
+    if status_filter:
+        filters["status"] = status_filter
+    
+    # Department filtering (admin only)
+    if department and user_role == "admin":
+        staff_department = department
+    
+    return filters, staff_department
+
+
 @router.get("/", response_model=AssignmentListResponse)
 async def list_assignments(
     staff_id: Optional[str] = Query(None, description="Filter by staff ID"),
@@ -272,68 +313,28 @@ async def list_assignments(
 ):
     """List assignments with filtering and pagination."""
     try:
-        filters = {}
         user_role = current_user["profile"]["role"]
-        user_id = current_user["profile"]["id"]
-        
-        # Role-based filtering
-        if user_role == "staff":
-            filters["staff_id"] = user_id
-        elif user_role == "supervisor":
-            # Supervisors can see assignments for themselves AND their department staff
-            user_department = current_user["profile"]["department"]
-            dept_staff = get_data("profiles", {"department": user_department, "role": ["staff", "supervisor"]})
-            dept_staff_ids = [s["id"] for s in dept_staff]
-            if dept_staff_ids:
-                filters["staff_id"] = dept_staff_ids
-            else:
-                # No staff in department, return empty
-                return AssignmentListResponse(
-                    success=True,
-                    assignments=[],
-                    pagination=PaginationResponse(
-                        total=0, page=page, per_page=per_page, 
-                        total_pages=1, has_next=False, has_prev=False
-                    )
-                )
-        elif staff_id:
-            filters["staff_id"] = staff_id
-        
-        # Apply other filters
-        if issue_id:
-            filters["issue_id"] = issue_id
-        if status_filter:
-            filters["status"] = status_filter
-        
-        # Department filtering (admin only)
-        if department and user_role == "admin":
-            dept_staff = get_data("profiles", {"department": department, "role": ["staff", "supervisor"]})
-            dept_staff_ids = [s["id"] for s in dept_staff]
-            if dept_staff_ids:
-                if "staff_id" in filters:
-                    # Intersect with existing staff_id filter
-                    if isinstance(filters["staff_id"], list):
-                        filters["staff_id"] = [sid for sid in filters["staff_id"] if sid in dept_staff_ids]
-                    else:
-                        filters["staff_id"] = [filters["staff_id"]] if filters["staff_id"] in dept_staff_ids else []
-                else:
-                    filters["staff_id"] = dept_staff_ids
-        
-        # Get assignments with pagination
-        assignments, total = get_assignments_with_details(
-            filters=filters,
-            page=page,
-            per_page=per_page
+        list_filters = _build_list_filters(
+            current_user, staff_id, issue_id, status_filter, department
         )
         
-        # Process assignments data
-        processed_assignments = []
-        for assignment in assignments:
-            assignment_data = _process_assignment_data(assignment)
-            processed_assignments.append(AssignmentResponse(**assignment_data))
+        if list_filters is None:
+            assignments, total = [], 0
+        else:
+            filters, staff_department = list_filters
+            # Get assignments with pagination (department is filtered in the database)
+            assignments, total = await aget_assignments_with_details(
+                filters=filters,
+                page=page,
+                per_page=per_page,
+                department=staff_department
+            )
+        
+        # Process assignments data (validated as a batch by AssignmentListResponse)
+        processed_assignments = [_process_assignment_data(a) for a in assignments]
         
         # Calculate pagination metadata
-        total_pages = math.ceil(total / per_page) if total > 0 else 1
+        total_pages = max(1, -(-total // per_page))
         
         pagination = PaginationResponse(
             total=total,
@@ -376,18 +377,15 @@ async def get_my_assignments(
         if status_filter:
             filters["status"] = status_filter
         
-        assignments, total = get_assignments_with_details(
+        assignments, total = await aget_assignments_with_details(
             filters=filters,
             page=page,
             per_page=per_page
         )
         
-        processed_assignments = []
-        for assignment in assignments:
-            assignment_data = _process_assignment_data(assignment)
-            processed_assignments.append(AssignmentResponse(**assignment_data))
+        processed_assignments = [_process_assignment_data(a) for a in assignments]
         
-        total_pages = math.ceil(total / per_page) if total > 0 else 1
+        total_pages = max(1, -(-total // per_page))
         pagination = PaginationResponse(
             total=total, page=page, per_page=per_page, total_pages=total_pages,
             has_next=page < total_pages, has_prev=page > 1
@@ -407,22 +405,61 @@ async def get_my_assignments(
         )
 
 
+@router.get("/stream")
+async def stream_assignments(
+    staff_id: Optional[str] = Query(None, description="Filter by staff ID"),
+    issue_id: Optional[int] = Query(None, description="Filter by issue ID"),
+    status_filter: Optional[Literal["assigned", "in_progress", "completed"]] = Query(None, alias="status"),
+    department: Optional[str] = Query(None, description="Filter by department"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stream a page of assignments as NDJSON (one assignment per line)."""
+    try:
+        list_filters = _build_list_filters(
+            current_user, staff_id, issue_id, status_filter, department
+        )
+        
+        if list_filters is None:
+            assignments = []
+        else:
+            filters, staff_department = list_filters
+            assignments, _ = await aget_assignments_with_details(
+                filters=filters,
+                page=page,
+                per_page=per_page,
+                department=staff_department
+            )
+        
+    except Exception as e:
+        logger.error(f"Failed to stream assignments: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch assignments"
+        )
+    
+    def rows():
+        for assignment in assignments:
+            row = AssignmentResponse(**_process_assignment_data(assignment))
+            yield orjson.dumps(row.model_dump()) + b"\n"
+    
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
 @router.get("/{assignment_id}", response_model=AssignmentResponse)
 async def get_assignment(
     assignment_id: int, 
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user)
 ):
     """Get assignment by ID."""
     try:
-        assignments = get_data(
+        assignments = await aget_data(
             "issue_assignments",
             {"id": assignment_id},
-            select_fields="""
-            *, 
-            staff:profiles!staff_id(full_name, department, role),
-            assigned_by_profile:profiles!assigned_by(full_name),
-            issues!issue_id(title, category)
-            """
+            select_fields=ASSIGNMENT_SELECT
         )
         
         if not assignments:
@@ -432,15 +469,17 @@ async def get_assignment(
             )
         
         assignment = assignments[0]
-        user_role = current_user["profile"]["role"]
-        user_id = current_user["profile"]["id"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_id = profile["id"]
         
         # Permission check
         if user_role in ["staff", "supervisor"] and assignment["staff_id"] != user_id:
             # Check if supervisor can view staff's assignments in their department
             if user_role == "supervisor":
-                staff_data = get_data("profiles", {"id": assignment["staff_id"]})
-                if staff_data and staff_data[0].get("department") != current_user["profile"]["department"]:
+                # The staff profile is already embedded in the fetched row
+                staff_profile = assignment.get("staff")
+                if staff_profile and staff_profile.get("department") != profile.get("department"):
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
                         detail="Not authorized to view assignments outside your department"
@@ -451,6 +490,12 @@ async def get_assignment(
                     detail="Not authorized to view this assignment"
                 )
         
+        # Unchanged since the client's last fetch: skip processing and serialization
+        etag = _assignment_etag(assignment)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        response.headers["ETag"] = etag
         assignment_data = _process_assignment_data(assignment)
         return AssignmentResponse(**assignment_data)
         
@@ -472,76 +517,58 @@ async def update_assignment(
 ):
     """Update assignment status."""
     try:
-        # Check if assignment exists
-        existing_assignments = get_data("issue_assignments", {"id": assignment_id})
-        if not existing_assignments:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
-            )
-        
-        existing_assignment = existing_assignments[0]
-        user_role = current_user["profile"]["role"]
-        user_id = current_user["profile"]["id"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_id = profile["id"]
+        match = {"id": assignment_id}
         
         # Permission check
-        if user_role in ["staff", "supervisor"] and existing_assignment["staff_id"] != user_id:
-            if user_role == "supervisor":
+        if user_role == "staff":
+            # Staff can only update their own assignments, so scope the write to them
+            match["staff_id"] = user_id
+        elif user_role == "supervisor":
+            existing_assignments = await aget_data("issue_assignments", {"id": assignment_id}, select_fields="staff_id")
+            if not existing_assignments:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Assignment not found"
+                )
+            
+            assignment_staff_id = existing_assignments[0]["staff_id"]
+            if assignment_staff_id != user_id:
                 # Check if staff is in supervisor's department
-                staff_data = get_data("profiles", {"id": existing_assignment["staff_id"]})
-                if staff_data and staff_data[0].get("department") != current_user["profile"]["department"]:
+                staff_meta = await ProfileService.get_profile_meta(assignment_staff_id)
+                if staff_meta and staff_meta["department"] != profile.get("department"):
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
                         detail="Not authorized to update assignments outside your department"
                     )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to update this assignment"
-                )
         
-        # Update assignment
+        # Update assignment; no rows back means it doesn't exist (or isn't the caller's)
         update_dict = assignment_update.dict(exclude_unset=True)
-        updated_assignments = update_data("issue_assignments", {"id": assignment_id}, update_dict)
+        updated_assignments = await aupdate_data(
+            "issue_assignments",
+            match,
+            update_dict,
+            select_fields=ASSIGNMENT_SELECT
+        )
         
         if not updated_assignments:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update assignment"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assignment not found"
             )
         
         # Update issue status based on assignment status
-        issue_id = existing_assignment["issue_id"]
+        issue_id = updated_assignments[0]["issue_id"]
         if assignment_update.status == "completed":
-            # Check if all assignments for this issue are completed
-            all_assignments = get_data("issue_assignments", {"issue_id": issue_id})
-            all_completed = all(a["status"] == "completed" for a in all_assignments)
-            
-            if all_completed:
-                update_data("issues", {"id": issue_id}, {"status": "resolved"})
+            # Resolve the issue if all of its assignments are completed (checked in the database)
+            await aexecute_rpc("fn_maybe_resolve_issue", {"issue_id": issue_id})
         elif assignment_update.status == "in_progress":
             # Ensure issue is marked as in_progress
-            update_data("issues", {"id": issue_id}, {"status": "in_progress"})
+            await aupdate_data("issues", {"id": issue_id}, {"status": "in_progress"})
         
-        # Get updated assignment with related data
-        updated_assignment = get_data(
-            "issue_assignments",
-            {"id": assignment_id},
-            select_fields="""
-            *, 
-            staff:profiles!staff_id(full_name, department, role),
-            assigned_by_profile:profiles!assigned_by(full_name),
-            issues!issue_id(title, category)
-            """
-        )
-        
-        if not updated_assignment:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve updated assignment"
-            )
-        
-        assignment_data = _process_assignment_data(updated_assignment[0])
+        assignment_data = _process_assignment_data(updated_assignments[0])
         
         logger.info(f"Assignment {assignment_id} updated by {user_id}")
         return AssignmentResponse(**assignment_data)
@@ -563,38 +590,44 @@ async def delete_assignment(
 ):
     """Delete assignment (admin/supervisor only)."""
     try:
-        user_role = current_user["profile"]["role"]
-        
-        # Check if assignment exists
-        existing_assignments = get_data("issue_assignments", {"id": assignment_id})
-        if not existing_assignments:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Assignment not found"
-            )
-        
-        assignment = existing_assignments[0]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_id = profile["id"]
         
         # Permission check for supervisors
         if user_role == "supervisor":
-            staff_data = get_data("profiles", {"id": assignment["staff_id"]})
-            if staff_data and staff_data[0].get("department") != current_user["profile"]["department"]:
+            existing_assignments = await aget_data("issue_assignments", {"id": assignment_id}, select_fields="staff_id")
+            if not existing_assignments:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Assignment not found"
+                )
+            
+            staff_meta = await ProfileService.get_profile_meta(existing_assignments[0]["staff_id"])
+            if staff_meta and staff_meta["department"] != profile.get("department"):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Not authorized to delete assignments outside your department"
                 )
         
-        # Delete assignment
-        delete_data("issue_assignments", {"id": assignment_id})
+        # Delete assignment; no rows back means it didn't exist
+        deleted_assignments = await adelete_data("issue_assignments", {"id": assignment_id})
+        if not deleted_assignments:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assignment not found"
+            )
         
         # Update issue status if no more assignments exist
-        issue_id = assignment["issue_id"]
-        remaining_assignments = get_data("issue_assignments", {"issue_id": issue_id})
+        issue_id = deleted_assignments[0]["issue_id"]
+        remaining_assignments = await aget_data(
+            "issue_assignments", {"issue_id": issue_id}, select_fields="id", limit=1
+        )
         
         if not remaining_assignments:
-            update_data("issues", {"id": issue_id}, {"status": "pending"})
+            await aupdate_data("issues", {"id": issue_id}, {"status": "pending"})
         
-        logger.info(f"Assignment {assignment_id} deleted by {current_user['profile']['id']}")
+        logger.info(f"Assignment {assignment_id} deleted by {user_id}")
         return BaseResponse(success=True, message="Assignment deleted successfully")
         
     except HTTPException:
@@ -613,12 +646,28 @@ async def bulk_assign_issues(
     current_user: dict = Depends(require_roles(["admin", "supervisor"]))
 ):
     """Assign multiple issues to a single staff member or supervisor."""
+    # Cheap guards before any DB work
+    if not bulk_request.issue_ids:
+        return BulkOperationResponse(
+            success=True,
+            message="No issues to assign",
+            processed=0,
+            failed=0,
+            errors=[]
+        )
+    if len(bulk_request.issue_ids) > MAX_BULK_ASSIGN:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot assign more than {MAX_BULK_ASSIGN} issues at once"
+        )
+    
     try:
-        user_role = current_user["profile"]["role"]
-        user_id = current_user["profile"]["id"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_id = profile["id"]
         
         # Validate assignee
-        assignee = get_data("profiles", {"id": bulk_request.staff_id})
+        assignee = await aget_data("profiles", {"id": bulk_request.staff_id})
         if not assignee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -637,10 +686,7 @@ async def bulk_assign_issues(
         
         # Check department permissions for supervisors
         if user_role == "supervisor":
-            user_department = current_user["profile"]["department"]
-            assignee_department = assignee_profile.get("department")
-            
-            if user_department != assignee_department:
+            if profile.get("department") != assignee_profile.get("department"):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Cannot assign to users outside your department"
@@ -649,62 +695,69 @@ async def bulk_assign_issues(
         processed = 0
         failed = 0
         errors = []
-        
+
+        # Fetch all requested issues and existing active assignments up front
+        issues = {i["id"]: i for i in await aget_data("issues", {"id": bulk_request.issue_ids})}
+        already_assigned = {
+            a["issue_id"] for a in await aget_data("issue_assignments", {
+                "issue_id": bulk_request.issue_ids,
+                "staff_id": bulk_request.staff_id,
+                "status": ["assigned", "in_progress"]
+            }, select_fields="issue_id")
+        }
+
+        to_create = []
         for issue_id in bulk_request.issue_ids:
+            if issue_id not in issues:
+                errors.append(f"Issue {issue_id} not found")
+                failed += 1
+            elif issue_id in already_assigned:
+                errors.append(f"Issue {issue_id} already assigned to this {assignee_role}")
+                failed += 1
+            else:
+                to_create.append(issue_id)
+                # Repeated ids in the same request count as duplicates
+                already_assigned.add(issue_id)
+
+        created_ids = []
+        if to_create:
+            # Create all assignments in a single insert
             try:
-                # Check if issue exists
-                issues = get_data("issues", {"id": issue_id})
-                if not issues:
-                    errors.append(f"Issue {issue_id} not found")
-                    failed += 1
-                    continue
-                
-                # Check if already assigned
-                existing = get_data("issue_assignments", {
-                    "issue_id": issue_id,
-                    "staff_id": bulk_request.staff_id,
-                    "status": ["assigned", "in_progress"]
-                })
-                
-                if existing:
-                    errors.append(f"Issue {issue_id} already assigned to this {assignee_role}")
-                    failed += 1
-                    continue
-                
-                # Create assignment
-                assignment_data = {
-                    "issue_id": issue_id,
-                    "staff_id": bulk_request.staff_id,
-                    "assigned_by": user_id,
-                    "notes": bulk_request.notes
-                }
-                
-                result = insert_data("issue_assignments", assignment_data)
-                if result:
-                    # Update issue status
-                    issue = issues[0]
-                    if issue["status"] == "pending":
-                        update_data("issues", {"id": issue_id}, {"status": "in_progress"})
-                    processed += 1
-                    
-                    # Send notification
-                    try:
-                        notification_service = NotificationService()
-                        await notification_service.notify_assignment_created(
-                            assignee_id=bulk_request.staff_id,
-                            issue_id=issue_id,
-                            assigned_by=user_id
-                        )
-                    except Exception as e:
-                        logger.warning(f"Failed to send notification for issue {issue_id}: {str(e)}")
-                else:
+                result = await ainsert_data("issue_assignments", [
+                    {
+                        "issue_id": issue_id,
+                        "staff_id": bulk_request.staff_id,
+                        "assigned_by": user_id,
+                        "notes": bulk_request.notes
+                    }
+                    for issue_id in to_create
+                ])
+                created_ids = [a["issue_id"] for a in result]
+            except Exception as e:
+                logger.error(f"Bulk insert of assignments failed: {str(e)}")
+                errors.append(f"Error assigning issues: {str(e)}")
+
+            created = set(created_ids)
+            for issue_id in to_create:
+                if issue_id not in created:
                     errors.append(f"Failed to assign issue {issue_id}")
                     failed += 1
-                    
-            except Exception as e:
-                errors.append(f"Error assigning issue {issue_id}: {str(e)}")
-                failed += 1
-        
+            processed = len(created_ids)
+
+        if created_ids:
+            # Move pending issues to in_progress in one update
+            pending_ids = [i for i in created_ids if issues[i]["status"] == "pending"]
+            if pending_ids:
+                await aupdate_data("issues", {"id": pending_ids}, {"status": "in_progress"})
+
+            # Send all notifications in one batch
+            sent = await NotificationService.notify_bulk_assignments(
+                [(bulk_request.staff_id, issue_id) for issue_id in created_ids],
+                assigned_by=user_id
+            )
+            if sent < len(created_ids):
+                logger.warning(f"Sent {sent}/{len(created_ids)} bulk assignment notifications")
+
         message = f"Processed {processed} assignments to {assignee_role}"
         if failed > 0:
             message += f", {failed} failed"
@@ -727,51 +780,69 @@ async def bulk_assign_issues(
         )
 
 
-@router.get("/stats/workload")
+async def _assignment_counts_by_staff(user_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Per-user assignment counts by status, aggregated in the database."""
+    counts = defaultdict(lambda: defaultdict(int))
+    if not user_ids:
+        return counts
+    rows = await aexecute_rpc("assignment_counts_by_staff", {"staff_ids": user_ids})
+    for row in rows or []:
+        counts[row["staff_id"]][row["status"]] = row["cnt"]
+    return counts
+
+
+def _busiest_page(rows: List[dict], limit: int, offset: int) -> List[dict]:
+    """One page of workload rows ordered by active assignments (highest first)."""
+    top = heapq.nlargest(offset + limit, rows, key=lambda x: x["active_assignments"])
+    return top[offset:]
+
+
+@router.get("/stats/workload", response_model=WorkloadResponse)
 async def get_workload_distribution(
+    limit: int = Query(50, ge=1, le=500, description="Max workload rows to return"),
+    offset: int = Query(0, ge=0, description="Workload rows to skip"),
     current_user: dict = Depends(require_roles(["admin", "supervisor"]))
 ):
     """Get workload distribution across staff members and supervisors."""
     try:
-        user_role = current_user["profile"]["role"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_department = profile.get("department")
         
         # Get staff members and supervisors based on role
         if user_role == "supervisor":
-            user_department = current_user["profile"]["department"]
-            assignable_users = get_data("profiles", {
-                "role": ["staff", "supervisor"],
-                "department": user_department
-            })
+            # A supervisor without a department has no roster (not the org-wide one)
+            assignable_users = (
+                await ProfileService.get_roster(["staff", "supervisor"], user_department)
+                if user_department else []
+            )
         else:
-            assignable_users = get_data("profiles", {"role": ["staff", "supervisor"]})
+            assignable_users = await ProfileService.get_roster(["staff", "supervisor"])
         
         if not assignable_users:
             return {
                 "total_staff": 0,
                 "total_supervisors": 0,
                 "avg_workload": 0,
-                "workload_distribution": []
+                "workload_distribution": [],
+                "total": 0,
+                "limit": limit,
+                "offset": offset
             }
         
+        # Status counts per user are aggregated in the database
+        counts = await _assignment_counts_by_staff([u["id"] for u in assignable_users])
+        
         workload_data = []
         total_active_assignments = 0
         staff_count = 0
         supervisor_count = 0
         
         for user in assignable_users:
-            # Get active assignments
-            active_assignments = get_data("issue_assignments", {
-                "staff_id": user["id"],
-                "status": ["assigned", "in_progress"]
-            })
-            
-            total_assignments = get_data("issue_assignments", {"staff_id": user["id"]})
-            completed_assignments = get_data("issue_assignments", {
-                "staff_id": user["id"],
-                "status": "completed"
-            })
-            
-            active_count = len(active_assignments)
+            user_counts = counts[user["id"]]
+            active_count = user_counts["assigned"] + user_counts["in_progress"]
+            completed_count = user_counts["completed"]
+            total_count = sum(user_counts.values())
             total_active_assignments += active_count
             
             if user["role"] == "staff":
@@ -785,25 +856,24 @@ async def get_workload_distribution(
                 "role": user["role"],
                 "department": user.get("department", "Unknown"),
                 "active_assignments": active_count,
-                "total_assignments": len(total_assignments),
-                "completed_assignments": len(completed_assignments),
-                "completion_rate": round(
-                    (len(completed_assignments) / len(total_assignments) * 100) if total_assignments else 0, 
-                    1
-                )
+                "total_assignments": total_count,
+                "completed_assignments": completed_count,
+                "completion_rate": round(completed_count * 100.0 / total_count, 1) if total_count else 0.0
             })
         
-        avg_workload = round(total_active_assignments / len(assignable_users), 1) if assignable_users else 0
-        
-        # Sort by active assignments (highest first)
-        workload_data.sort(key=lambda x: x["active_assignments"], reverse=True)
+        # assignable_users is non-empty here (early return above)
+        avg_workload = round(total_active_assignments / len(assignable_users), 1)
         
+        logger.info(f"Workload for {user_role}: users={len(assignable_users)} active={total_active_assignments}")
         return {
             "total_staff": staff_count,
             "total_supervisors": supervisor_count,
             "total_active_assignments": total_active_assignments,
             "avg_workload": avg_workload,
-            "workload_distribution": workload_data
+            "workload_distribution": _busiest_page(workload_data, limit, offset),
+            "total": len(workload_data),
+            "limit": limit,
+            "offset": offset
         }
         
     except Exception as e:
@@ -822,7 +892,9 @@ async def get_assignable_users(
 ):
     """Get list of users that can be assigned tasks (staff and supervisors)."""
     try:
-        user_role = current_user["profile"]["role"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
+        user_department = profile.get("department")
         
         # Base filter - can assign to both staff and supervisors
         if role and role in ["staff", "supervisor"]:
@@ -832,37 +904,34 @@ async def get_assignable_users(
         
         # Staff can only see supervisors in their department
         if user_role == "staff":
-            user_department = current_user["profile"]["department"]
             if user_department:
                 filters["department"] = user_department
                 filters["role"] = ["supervisor"]  # Staff can only assign to supervisors
         # Supervisors can only see users in their department
         elif user_role == "supervisor":
-            user_department = current_user["profile"]["department"]
             if user_department:
                 filters["department"] = user_department
         # Admin can optionally filter by department
         elif department:
             filters["department"] = department
         
-        assignable_users = get_data("profiles", filters=filters, order_by="full_name")
+        assignable_users = await ProfileService.get_roster(filters["role"], filters.get("department"))
+        
+        # Active assignment counts per user are aggregated in the database
+        counts = await _assignment_counts_by_staff([u["id"] for u in assignable_users])
         
         # Add workload information for each user
         users_with_workload = []
         for user in assignable_users:
-            # Get active assignments count
-            active_assignments = get_data(
-                "issue_assignments",
-                {"staff_id": user["id"], "status": ["assigned", "in_progress"]}
-            )
-            
+            user_counts = counts[user["id"]]
+            active_count = user_counts["assigned"] + user_counts["in_progress"]
             users_with_workload.append({
                 "id": user["id"],
                 "full_name": user["full_name"],
                 "role": user["role"],
                 "department": user.get("department"),
-                "active_assignments": len(active_assignments),
-                "is_available": len(active_assignments) < 10  # Consider available if < 10 active tasks
+                "active_assignments": active_count,
+                "is_available": active_count < 10  # Consider available if < 10 active tasks
             })
         
         logger.info(f"Listed {len(users_with_workload)} assignable users for {user_role}")
@@ -876,25 +945,24 @@ async def get_assignable_users(
         )
 
 
-@router.get("/stats/department")
+@router.get("/stats/department", response_model=DepartmentAssignmentStatsResponse)
 async def get_department_assignment_stats(
     department: Optional[str] = Query(None, description="Department filter"),
+    limit: int = Query(50, ge=1, le=500, description="Max user workload rows to return"),
+    offset: int = Query(0, ge=0, description="User workload rows to skip"),
     current_user: dict = Depends(require_roles(["admin", "supervisor", "staff"]))
 ):
     """Get assignment statistics by department."""
     try:
-        user_role = current_user["profile"]["role"]
+        profile = current_user["profile"]
+        user_role = profile["role"]
         
         # Filter by department for supervisors and staff
         if user_role in ["supervisor", "staff"]:
-            department = current_user["profile"]["department"]
+            department = profile.get("department")
         
         # Get assignable users (staff and supervisors) in department(s)
-        filters = {"role": ["staff", "supervisor"]}
-        if department:
-            filters["department"] = department
-        
-        assignable_users = get_data("profiles", filters=filters)
+        assignable_users = await ProfileService.get_roster(["staff", "supervisor"], department)
         user_ids = [u["id"] for u in assignable_users]
         
         if not user_ids:
@@ -908,27 +976,34 @@ async def get_department_assignment_stats(
                     "in_progress": 0,
                     "completed": 0
                 },
-                "user_workload": []
+                "user_workload": [],
+                "total": 0,
+                "limit": limit,
+                "offset": offset
             }
         
-        # Get all assignments for these users
-        all_assignments = get_data("issue_assignments", {"staff_id": user_ids})
+        # Status counts per user are aggregated in the database
+        counts = await _assignment_counts_by_staff(user_ids)
         
-        # Calculate stats
+        # Build department totals and per-user workload in a single pass
         assignment_stats = {
-            "total_assignments": len(all_assignments),
-            "assigned": len([a for a in all_assignments if a["status"] == "assigned"]),
-            "in_progress": len([a for a in all_assignments if a["status"] == "in_progress"]),
-            "completed": len([a for a in all_assignments if a["status"] == "completed"])
+            "total_assignments": 0,
+            "assigned": 0,
+            "in_progress": 0,
+            "completed": 0
         }
-        
-        # Calculate individual user workload
         user_workload = []
         staff_count = 0
         supervisor_count = 0
         
         for user in assignable_users:
-            user_assignments = [a for a in all_assignments if a["staff_id"] == user["id"]]
+            user_counts = counts[user["id"]]
+            user_total = sum(user_counts.values())
+            
+            assignment_stats["total_assignments"] += user_total
+            assignment_stats["assigned"] += user_counts["assigned"]
+            assignment_stats["in_progress"] += user_counts["in_progress"]
+            assignment_stats["completed"] += user_counts["completed"]
             
             if user["role"] == "staff":
                 staff_count += 1
@@ -939,17 +1014,24 @@ async def get_department_assignment_stats(
                 "user_id": user["id"],
                 "name": user.get("full_name", "Unknown"),
                 "role": user["role"],
-                "total_assignments": len(user_assignments),
-                "active_assignments": len([a for a in user_assignments if a["status"] in ["assigned", "in_progress"]]),
-                "completed_assignments": len([a for a in user_assignments if a["status"] == "completed"])
+                "total_assignments": user_total,
+                "active_assignments": user_counts["assigned"] + user_counts["in_progress"],
+                "completed_assignments": user_counts["completed"]
             })
         
+        logger.info(
+            f"Department stats for {department or 'all departments'}: "
+            f"users={len(assignable_users)} assignments={assignment_stats['total_assignments']}"
+        )
         return {
             "department": department or "All Departments",
             "total_staff": staff_count,
             "total_supervisors": supervisor_count,
             "assignment_stats": assignment_stats,
-            "user_workload": sorted(user_workload, key=lambda x: x["active_assignments"], reverse=True)
+            "user_workload": _busiest_page(user_workload, limit, offset),
+            "total": len(user_workload),
+            "limit": limit,
+            "offset": offset
         }
         
     except Exception as e:
@@ -9,6 +9,7 @@ from app.schemas import (
     UserLogin, UserRegister, AuthResponse, ProfileResponse, 
     TokenResponse, BaseResponse
 )
+from app.services.profile_service import ProfileService
 from typing import Optional
 import logging
 from pydantic import BaseModel
@@ -185,6 +186,7 @@ async def register(request: Request):
                 
             if update_fields:
                 updated_profile = update_data("profiles", {"id": user_id}, update_fields)
+                ProfileService.invalidate_profile(user_id)
                 profile_data = updated_profile[0] if updated_profile else profile_data
             
             logger.info(f"Assigned role before update: {assigned_role}")
@@ -201,6 +203,7 @@ async def register(request: Request):
             }
             
             profile_result = insert_data("profiles", profile_data)
+            ProfileService.invalidate_profile(user_id)
             
             if not profile_result:
                 raise HTTPException(
@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from gradio_client import Client
-from typing import Optional
+from typing import List, Optional
+from cachetools import LRUCache
+import httpx
+import json
 import logging
+import os
+import redis.asyncio as aioredis
+from uuid import uuid4
 
 router = APIRouter(prefix="/chat", tags=["chatbot"])
 
@@ -11,6 +16,7 @@ logger = logging.getLogger(__name__)
 # Hardcoded Hugging Face Gradio Client Configuration
 HF_SPACE_URL = "PatientZero6969/civic-chatbot"
 API_NAME = "/ask_chatbot"
+HF_SPACE_HOST = "https://patientzero6969-civic-chatbot.hf.space"
 
 # Request/Response Models
 class ChatMessage(BaseModel):
@@ -22,26 +28,116 @@ class ChatResponse(BaseModel):
     conversation_id: str
     status: str
 
-# In-memory conversation storage (use database for production)
-conversations = {}
+# Conversation storage: Redis when REDIS_URL is set (shared across workers, expiring),
+# otherwise an in-process LRU cache for local development
+REDIS_URL = os.getenv("REDIS_URL")
+CONVERSATION_TTL_SECONDS = 3600
+MAX_CONVERSATION_MESSAGES = 50
+CONVERSATION_KEY_PREFIX = "conv:"
 
-# Initialize Gradio client (will be created on first use)
-gradio_client = None
+_redis = aioredis.from_url(REDIS_URL, decode_responses=True) if REDIS_URL else None
+MAX_LOCAL_CONVERSATIONS = 10_000
+# Least recently used conversations are evicted once the cap is reached
+conversations: LRUCache = LRUCache(maxsize=MAX_LOCAL_CONVERSATIONS)
 
-def get_gradio_client():
-    """Get or create Gradio client instance"""
-    global gradio_client
+
+async def append_message(conversation_id: str, message: dict) -> None:
+    """Append a message to a conversation, keeping only the most recent messages."""
+    if _redis is None:
+        history = conversations.setdefault(conversation_id, [])
+        history.append(message)
+        del history[:-MAX_CONVERSATION_MESSAGES]
+        return
+
+    key = f"{CONVERSATION_KEY_PREFIX}{conversation_id}"
+    async with _redis.pipeline(transaction=False) as pipe:
+        pipe.rpush(key, json.dumps(message))
+        pipe.ltrim(key, -MAX_CONVERSATION_MESSAGES, -1)
+        pipe.expire(key, CONVERSATION_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def get_messages(conversation_id: str) -> Optional[List[dict]]:
+    """Get a conversation's messages, or None if it doesn't exist."""
+    if _redis is None:
+        return conversations.get(conversation_id)
+
+    messages = await _redis.lrange(f"{CONVERSATION_KEY_PREFIX}{conversation_id}", 0, -1)
+    return [json.loads(m) for m in messages] if messages else None
+
+
+async def remove_conversation(conversation_id: str) -> bool:
+    """Delete a conversation; returns False if it didn't exist."""
+    if _redis is None:
+        return conversations.pop(conversation_id, None) is not None
+
+    return bool(await _redis.delete(f"{CONVERSATION_KEY_PREFIX}{conversation_id}"))
+
+
+async def clear_conversations() -> None:
+    """Delete all conversations."""
+    if _redis is None:
+        conversations.clear()
+        return
+
+    batch = []
+    async for key in _redis.scan_iter(match=f"{CONVERSATION_KEY_PREFIX}*", count=500):
+        batch.append(key)
+        if len(batch) >= 500:
+            await _redis.delete(*batch)
+            batch = []
+    if batch:
+        await _redis.delete(*batch)
+
+# Shared async HTTP client for the Space's Gradio REST API (reused across requests)
+_http = httpx.AsyncClient(base_url=HF_SPACE_HOST, timeout=30, http2=True)
+
+
+@router.on_event("startup")
+async def warm_up_http_client():
+    """Open the connection to the Space (DNS, TLS, HTTP/2) before the first chat request."""
     try:
-        if gradio_client is None:
-            gradio_client = Client(HF_SPACE_URL)
-            logger.info(f"Gradio client initialized for {HF_SPACE_URL}")
-        return gradio_client
+        # Short timeout so an unreachable Space doesn't hold up worker startup
+        await _http.get("/gradio_api/info", timeout=5)
+        logger.info(f"Chatbot HTTP client warmed up for {HF_SPACE_URL}")
     except Exception as e:
-        logger.error(f"Failed to initialize Gradio client: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to connect to chatbot service"
-        )
+        # The Space may be asleep; requests will connect on demand
+        logger.warning(f"Chatbot warm-up failed: {str(e)}")
+
+
+@router.on_event("shutdown")
+async def close_http_client():
+    """Close the shared chatbot HTTP client."""
+    await _http.aclose()
+    if _redis is not None:
+        await _redis.aclose()
+
+
+async def ask_gradio(message: str) -> str:
+    """Call the Space's ask_chatbot endpoint and return the generated answer.
+
+    Gradio's REST API queues the call (POST returns an event id) and streams
+    the result back as server-sent events.
+    """
+    call_path = f"/gradio_api/call{API_NAME}"
+    response = await _http.post(call_path, json={"data": [message]})
+    response.raise_for_status()
+    event_id = response.json()["event_id"]
+
+    event = None
+    async with _http.stream("GET", f"{call_path}/{event_id}") as stream:
+        stream.raise_for_status()
+        async for line in stream.aiter_lines():
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:") and event in ("complete", "error"):
+                data = line[len("data:"):].strip()
+                if event == "error":
+                    raise RuntimeError(f"Gradio call failed: {data}")
+                result = json.loads(data)
+                return str(result[0]) if result and result[0] else "No response generated"
+
+    raise RuntimeError("Gradio call ended without a result")
 
 @router.post("/query")
 async def query_chatbot(request: ChatMessage):
@@ -54,26 +150,17 @@ async def query_chatbot(request: ChatMessage):
             raise HTTPException(status_code=400, detail="Message cannot be empty")
 
         # Initialize conversation if needed
-        conversation_id = request.conversation_id or f"conv_{id(request)}"
-        if conversation_id not in conversations:
-            conversations[conversation_id] = []
+        conversation_id = request.conversation_id or uuid4().hex
 
         # Store user message
-        conversations[conversation_id].append({
+        await append_message(conversation_id, {
             "role": "user",
             "content": request.message
         })
 
-        # Get Gradio client
-        client = get_gradio_client()
-
         # Call Gradio API
         try:
-            result = client.predict(
-                question=request.message,
-                api_name=API_NAME
-            )
-            bot_response = str(result) if result else "No response generated"
+            bot_response = await ask_gradio(request.message)
         except Exception as e:
             logger.error(f"Gradio API call failed: {str(e)}")
             raise HTTPException(
@@ -82,7 +169,7 @@ async def query_chatbot(request: ChatMessage):
             )
 
         # Store bot response
-        conversations[conversation_id].append({
+        await append_message(conversation_id, {
             "role": "assistant",
             "content": bot_response
         })
@@ -110,12 +197,13 @@ async def get_conversation(conversation_id: str):
     Retrieve conversation history
     Endpoint: GET /chat/conversation/{conversation_id}
     """
-    if conversation_id not in conversations:
+    messages = await get_messages(conversation_id)
+    if messages is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
     return {
         "conversation_id": conversation_id,
-        "messages": conversations[conversation_id]
+        "messages": messages
     }
 
 @router.delete("/conversation/{conversation_id}")
@@ -124,8 +212,7 @@ async def delete_conversation(conversation_id: str):
     Delete a conversation
     Endpoint: DELETE /chat/conversation/{conversation_id}
     """
-    if conversation_id in conversations:
-        del conversations[conversation_id]
+    if await remove_conversation(conversation_id):
         return {"status": "success", "message": "Conversation deleted"}
     raise HTTPException(status_code=404, detail="Conversation not found")
 
@@ -135,7 +222,7 @@ async def reset_chatbot():
     Clear all conversations
     Endpoint: POST /chat/reset
     """
-    conversations.clear()
+    await clear_conversations()
     return {"status": "success", "message": "All conversations cleared"}
 
 @router.get("/health")
@@ -145,7 +232,8 @@ async def chatbot_health():
     Endpoint: GET /chat/health
     """
     try:
-        client = get_gradio_client()
+        response = await _http.get("/gradio_api/info")
+        response.raise_for_status()
         return {
             "status": "healthy",
             "chatbot_service": "Gradio",
@@ -12,9 +12,11 @@ from app.routes.auth import get_current_user, require_roles, get_current_user_op
 from app.services.notification_service import NotificationService
 from app.utils.helpers import generate_uuid, validate_image_file, compress_image
 from typing import List, Optional, Literal
+import asyncio
 import logging
 import math
 import os
+import threading
 from datetime import datetime
 from io import BytesIO
 
@@ -65,6 +67,22 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 BUCKET_NAME = "project0_storage"
 
+# Image classifier Space client, created once on first use (creation does a blocking handshake)
+IMAGE_CLASSIFIER_SPACE = "PatientZero6969/civic-issue-image-classifier"
+_classifier_client = None
+_classifier_client_lock = threading.Lock()
+
+
+def get_classifier_client():
+    """Get or create the Gradio client for the image classifier Space (thread-safe)."""
+    global _classifier_client
+    with _classifier_client_lock:
+        if _classifier_client is None:
+            from gradio_client import Client
+            _classifier_client = Client(IMAGE_CLASSIFIER_SPACE)
+            logger.info(f"Gradio client initialized for {IMAGE_CLASSIFIER_SPACE}")
+        return _classifier_client
+
 
 def _process_issue_data(issue_data: dict, user_vote_status: dict = None) -> dict:
     """Process raw issue data to include additional fields."""
@@ -1332,7 +1350,7 @@ async def predict_category_from_image_url(
     """Predict issue category from image URL using HuggingFace API."""
     try:
         import httpx
-        from gradio_client import Client, handle_file
+        from gradio_client import handle_file
         import tempfile
         import os
         
@@ -1369,10 +1387,12 @@ async def predict_category_from_image_url(
         try:
             # Call HuggingFace Gradio API
             logger.info("🤖 Calling HuggingFace Gradio API...")
-            client = Client("PatientZero6969/civic-issue-image-classifier")
+            # gradio_client is synchronous, so run it off the event loop
+            client = await asyncio.to_thread(get_classifier_client)
             
             # ✅ CRITICAL FIX: Use handle_file() like in your test
-            result = client.predict(
+            result = await asyncio.to_thread(
+                client.predict,
                 image=handle_file(tmp_path),  # ✅ Using handle_file()
                 api_name="/predict_issue"
             )
@@ -5,6 +5,7 @@ from app.schemas import (
     BaseResponse
 )
 from app.routes.auth import get_current_user, require_roles
+from app.services.profile_service import ProfileService
 from typing import List, Optional
 import logging
 
@@ -357,6 +358,7 @@ async def update_user(
         
         # Update user
         updated_users = update_data("profiles", {"id": user_id}, update_dict)
+        ProfileService.invalidate_profile(user_id)
         
         if not updated_users:
             raise HTTPException(
@@ -489,6 +491,7 @@ async def change_user_role(
         
         # Update role
         updated_users = update_data("profiles", {"id": user_id}, {"role": new_role})
+        ProfileService.invalidate_profile(user_id)
         
         if not updated_users:
             raise HTTPException(
@@ -430,9 +430,12 @@ class DepartmentStatsResponse(BaseResponse):
 
 
 # Bulk operations schemas
+MAX_BULK_ASSIGN = 50  # Upper bound on issues per bulk assignment request (enforced by the handler)
+
+
 class BulkAssignRequest(BaseModel):
     """Bulk assignment request."""
-    issue_ids: List[int] = Field(..., min_items=1, max_items=50)
+    issue_ids: List[int]
     staff_id: str  # Can be staff or supervisor ID
     notes: Optional[str] = Field(None, max_length=500)
 
@@ -491,12 +494,6 @@ class AnalyticsResponse(BaseResponse):
     """Analytics response."""
     metrics: PerformanceMetrics
 
-class BulkAssignRequest(BaseModel):
-    """Bulk assignment request."""
-    issue_ids: List[int] = Field(..., min_items=1, max_items=50)
-    staff_id: str  # Can be staff or supervisor
-    notes: Optional[str] = Field(None, max_length=500)
-
 class AssignableUser(BaseModel):
     """Assignable user model."""
     id: str
@@ -509,3 +506,58 @@ class AssignableUser(BaseModel):
 class AssignableUsersResponse(BaseResponse):
     """Assignable users response."""
     users: List[AssignableUser]
+
+
+# Workload schemas
+class WorkloadRow(BaseModel):
+    """Workload of a single staff member or supervisor."""
+    user_id: str
+    name: Optional[str] = None
+    role: str
+    department: Optional[str] = None
+    active_assignments: int
+    total_assignments: int
+    completed_assignments: int
+    completion_rate: float
+
+
+class WorkloadResponse(BaseModel):
+    """Workload distribution response (one page of rows, busiest first)."""
+    total_staff: int
+    total_supervisors: int
+    total_active_assignments: int = 0
+    avg_workload: float
+    workload_distribution: List[WorkloadRow]
+    total: int
+    limit: int
+    offset: int
+
+
+class UserWorkload(BaseModel):
+    """Per-user assignment counts within a department."""
+    user_id: str
+    name: Optional[str] = None
+    role: str
+    total_assignments: int
+    active_assignments: int
+    completed_assignments: int
+
+
+class AssignmentStatusCounts(BaseModel):
+    """Assignment counts by status."""
+    total_assignments: int
+    assigned: int
+    in_progress: int
+    completed: int
+
+
+class DepartmentAssignmentStatsResponse(BaseModel):
+    """Department assignment statistics response (one page of user workload, busiest first)."""
+    department: str
+    total_staff: int
+    total_supervisors: int
+    assignment_stats: AssignmentStatusCounts
+    user_workload: List[UserWorkload]
+    total: int
+    limit: int
+    offset: int
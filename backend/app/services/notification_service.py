@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
 from app.supabase_client import insert_data, get_data
@@ -105,7 +105,61 @@ class NotificationService:
         except Exception as e:
             logger.error(f"Failed to send assignment notification: {str(e)}")
             return False
-    
+
+    @staticmethod
+    async def notify_assignment_created(assignee_id: str, issue_id: int, assigned_by: str) -> bool:
+        """Notify an assignee (staff or supervisor) about a new assignment."""
+        try:
+            logger.info(f"Assignment created notification: issue {issue_id} assigned to {assignee_id}")
+
+            notification_data = {
+                "user_id": assignee_id,
+                "title": "New Issue Assigned",
+                "message": f"You have been assigned to work on issue #{issue_id}",
+                "type": "info",
+                "metadata": {
+                    "issue_id": issue_id,
+                    "assigned_by": assigned_by,
+                    "action": "assignment_created"
+                }
+            }
+
+            return NotificationService._create_notification(notification_data)
+
+        except Exception as e:
+            logger.error(f"Failed to send assignment created notification: {str(e)}")
+            return False
+
+    @staticmethod
+    async def notify_bulk_assignments(pairs: List[Tuple[str, int]], assigned_by: str) -> int:
+        """Notify assignees about a batch of new assignments in a single send."""
+        try:
+            if not pairs:
+                return 0
+
+            logger.info(f"Bulk assignment notification: {len(pairs)} assignments by {assigned_by}")
+
+            notifications = [
+                {
+                    "user_id": assignee_id,
+                    "title": "New Issue Assigned",
+                    "message": f"You have been assigned to work on issue #{issue_id}",
+                    "type": "info",
+                    "metadata": {
+                        "issue_id": issue_id,
+                        "assigned_by": assigned_by,
+                        "action": "assignment_created"
+                    }
+                }
+                for assignee_id, issue_id in pairs
+            ]
+
+            return NotificationService._create_notifications(notifications)
+
+        except Exception as e:
+            logger.error(f"Failed to send bulk assignment notifications: {str(e)}")
+            return 0
+
     @staticmethod
     def notify_issue_updated(issue: Dict[str, Any], update: Dict[str, Any], 
                            citizen: Dict[str, Any]) -> bool:
@@ -301,6 +355,28 @@ class NotificationService:
             logger.error(f"Failed to create notification: {str(e)}")
             return False
     
+    @staticmethod
+    def _create_notifications(notifications: List[Dict[str, Any]]) -> int:
+        """Create several notification records in one batch; returns how many were created."""
+        try:
+            created_at = datetime.now().isoformat()
+            for notification_data in notifications:
+                notification_data["created_at"] = created_at
+                notification_data["is_read"] = False
+            
+            # As with _create_notification, just log until the notifications table exists
+            logger.info(f"Created {len(notifications)} notifications in one batch")
+            
+            # Uncomment this if you have a notifications table (single multi-row insert):
+            # result = insert_data("notifications", notifications)
+            # return len(result)
+            
+            return len(notifications)
+            
+        except Exception as e:
+            logger.error(f"Failed to create notifications: {str(e)}")
+            return 0
+    
     @staticmethod
     def _notify_supervisors_of_new_issue(issue: Dict[str, Any]) -> bool:
         """Notify supervisors about new issues in their area of responsibility."""
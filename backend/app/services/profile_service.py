@@ -0,0 +1,68 @@
+from typing import Dict, Any, List, Optional
+import logging
+import threading
+from cachetools import TTLCache
+from app.supabase_client import aget_data
+
+logger = logging.getLogger(__name__)
+
+# profile id -> {"department", "role"}; departments/roles change rarely, so a short TTL is safe
+_profile_meta_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+# (roles, department) -> assignable-user roster; rosters change on a minute scale, not per request
+_roster_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+# Roster consumers (workload/assignable-user endpoints) only read these columns
+ROSTER_FIELDS = "id, full_name, role, department"
+_cache_lock = threading.Lock()
+
+
+class ProfileService:
+    """Cached profile lookups used by permission checks."""
+
+    @staticmethod
+    async def get_profile_meta(profile_id: str) -> Optional[Dict[str, Any]]:
+        """Get a profile's department and role, or None if the profile doesn't exist."""
+        with _cache_lock:
+            meta = _profile_meta_cache.get(profile_id)
+        if meta is not None:
+            return meta
+
+        profiles = await aget_data("profiles", {"id": profile_id}, select_fields="department, role")
+        if not profiles:
+            return None
+
+        meta = {"department": profiles[0].get("department"), "role": profiles[0].get("role")}
+        with _cache_lock:
+            _profile_meta_cache[profile_id] = meta
+        return meta
+
+    @staticmethod
+    async def get_roster(roles: List[str], department: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get id/full_name/role/department of profiles with any of the given roles
+        (optionally in one department), ordered by name.
+
+        The returned list is shared between callers and must not be mutated.
+        """
+        key = (tuple(sorted(roles)), department)
+        with _cache_lock:
+            roster = _roster_cache.get(key)
+        if roster is not None:
+            return roster
+
+        filters = {"role": list(roles)}
+        if department:
+            filters["department"] = department
+        roster = await aget_data("profiles", filters=filters, select_fields=ROSTER_FIELDS,
+                                 order_by="full_name")
+
+        with _cache_lock:
+            _roster_cache[key] = roster
+        return roster
+
+    @staticmethod
+    def invalidate_profile(profile_id: str) -> None:
+        """Drop cached data for a profile after it has been created or updated."""
+        with _cache_lock:
+            _profile_meta_cache.pop(profile_id, None)
+            # Any profile change can move a user between rosters
+            _roster_cache.clear()
+        logger.debug(f"Invalidated cached profile {profile_id}")
@@ -1,4 +1,5 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, acreate_client, AsyncClient
+import asyncio
 import os
 from typing import Dict, List, Optional, Any, Union, Tuple
 import logging
@@ -15,6 +16,21 @@ supabase_key = 'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJ
 # Create Supabase client
 supabase: Client = create_client(supabase_url, supabase_key)
 
+# Async client for async route handlers; created on first use inside the running event loop
+_async_supabase: Optional[AsyncClient] = None
+_async_supabase_lock = asyncio.Lock()
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Get or create the shared async Supabase client (pooled HTTP/2 connections)."""
+    global _async_supabase
+    if _async_supabase is None:
+        async with _async_supabase_lock:
+            if _async_supabase is None:
+                _async_supabase = await acreate_client(supabase_url, supabase_key)
+                logger.info("Async Supabase client initialized")
+    return _async_supabase
+
 # Add this to your supabase_client.py file, right after the existing client creation
 
 # Create a separate storage client with explicit service role permissions
@@ -52,11 +68,21 @@ def upload_file_from_bytes_with_service_role(bucket: str, file_name: str, file_b
         logger.error(f"Service role upload failed: {str(e)}")
         raise Exception(f"Service role upload failed: {str(e)}")
     
+def _with_select(query, select_fields: Optional[str]):
+    """Ask PostgREST to return the written rows with the given (embedded) selects."""
+    if select_fields:
+        # Writes already send Prefer: return=representation; ?select= shapes the rows returned
+        query.params = query.params.set("select", "".join(select_fields.split()))
+    return query
+
+
 # Basic CRUD Operations
-def insert_data(table: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+def insert_data(table: str, data: Dict[str, Any],
+                select_fields: Optional[str] = None) -> List[Dict[str, Any]]:
     """Insert a row into a Supabase table."""
     try:
-        response = supabase.table(table).insert(data).execute()
+        query = _with_select(supabase.table(table).insert(data), select_fields)
+        response = query.execute()
         logger.info(f"Inserted data into {table}: {len(response.data)} rows")
         return response.data
     except Exception as e:
@@ -64,65 +90,98 @@ def insert_data(table: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         raise Exception(f"Insert failed for table {table}: {str(e)}")
 
 
+def _build_select_query(client, table: str, filters: Optional[Dict[str, Any]] = None,
+                        select_fields: str = "*", order_by: Optional[str] = None,
+                        limit: Optional[int] = None, offset: Optional[int] = None):
+    """Build a filtered/ordered/paginated select query for the sync or async client."""
+    query = client.table(table).select(select_fields)
+    
+    if filters:
+        for col, val in filters.items():
+            if isinstance(val, list):
+                query = query.in_(col, val)
+            elif isinstance(val, dict) and 'operator' in val:
+                # Handle complex operators like gte, lte, ilike, etc.
+                op = val['operator']
+                value = val['value']
+                if op == 'gte':
+                    query = query.gte(col, value)
+                elif op == 'lte':
+                    query = query.lte(col, value)
+                elif op == 'gt':
+                    query = query.gt(col, value)
+                elif op == 'lt':
+                    query = query.lt(col, value)
+                elif op == 'ilike':
+                    query = query.ilike(col, value)
+                elif op == 'like':
+                    query = query.like(col, value)
+                elif op == 'neq':
+                    query = query.neq(col, value)
+                elif op == 'in':
+                    query = query.in_(col, value)
+                else:
+                    query = query.eq(col, value)
+            else:
+                query = query.eq(col, val)
+    
+    if order_by:
+        desc = order_by.startswith('-')
+        field = order_by.lstrip('-')
+        query = query.order(field, desc=desc)
+    
+    if limit:
+        query = query.limit(limit)
+    
+    if offset:
+        query = query.range(offset, offset + (limit or 1000) - 1)
+    
+    return query
+
+
+def _apply_match(query, match: Dict[str, Any]):
+    """Apply equality (or IN for list values) match filters to a write query."""
+    for col, val in match.items():
+        if isinstance(val, list):
+            query = query.in_(col, val)
+        else:
+            query = query.eq(col, val)
+    return query
+
+
+def _build_count_query(client, table: str, filters: Optional[Dict[str, Any]] = None,
+                       select_fields: str = "*"):
+    """Build an exact-count query for the sync or async client (HEAD: no rows are returned)."""
+    query = client.table(table).select(select_fields, count="exact", head=True)
+    if filters:
+        for col, val in filters.items():
+            if isinstance(val, list):
+                query = query.in_(col, val)
+            else:
+                query = query.eq(col, val)
+    return query
+
+
 def get_data(table: str, filters: Optional[Dict[str, Any]] = None,
             select_fields: str = "*", order_by: Optional[str] = None,
             limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
     """Fetch data from a Supabase table with optional filters and pagination."""
     try:
-        query = supabase.table(table).select(select_fields)
-        
-        if filters:
-            for col, val in filters.items():
-                if isinstance(val, list):
-                    query = query.in_(col, val)
-                elif isinstance(val, dict) and 'operator' in val:
-                    # Handle complex operators like gte, lte, ilike, etc.
-                    op = val['operator']
-                    value = val['value']
-                    if op == 'gte':
-                        query = query.gte(col, value)
-                    elif op == 'lte':
-                        query = query.lte(col, value)
-                    elif op == 'gt':
-                        query = query.gt(col, value)
-                    elif op == 'lt':
-                        query = query.lt(col, value)
-                    elif op == 'ilike':
-                        query = query.ilike(col, value)
-                    elif op == 'like':
-                        query = query.like(col, value)
-                    elif op == 'neq':
-                        query = query.neq(col, value)
-                    else:
-                        query = query.eq(col, value)
-                else:
-                    query = query.eq(col, val)
-        
-        if order_by:
-            desc = order_by.startswith('-')
-            field = order_by.lstrip('-')
-            query = query.order(field, desc=desc)
-        
-        if limit:
-            query = query.limit(limit)
-        
-        if offset:
-            query = query.range(offset, offset + (limit or 1000) - 1)
-        
+        query = _build_select_query(supabase, table, filters, select_fields, order_by, limit, offset)
         response = query.execute()
-        logger.info(f"Fetched {len(response.data)} rows from {table}")
+        logger.debug(f"Fetched {len(response.data)} rows from {table}")
         return response.data
     except Exception as e:
         logger.error(f"Fetch failed for table {table}: {str(e)}")
         raise Exception(f"Fetch failed for table {table}: {str(e)}")
 
 
-def update_data(table: str, match: Dict[str, Any], new_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+def update_data(table: str, match: Dict[str, Any], new_data: Dict[str, Any],
+                select_fields: Optional[str] = None) -> List[Dict[str, Any]]:
     """Update data in a Supabase table."""
     try:
-        query = supabase.table(table).update(new_data)
-        for col, val in match.items():
-            query = query.eq(col, val)
+        query = _with_select(supabase.table(table).update(new_data), select_fields)
+        query = _apply_match(query, match)
         response = query.execute()
         logger.info(f"Updated {len(response.data)} rows in {table}")
         return response.data
@@ -134,9 +193,7 @@ def update_data(table: str, match: Dict[str, Any], new_data: Dict[str, Any]) ->
 def delete_data(table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Delete data from a Supabase table."""
     try:
-        query = supabase.table(table).delete()
-        for col, val in filters.items():
-            query = query.eq(col, val)
+        query = _apply_match(supabase.table(table).delete(), filters)
         response = query.execute()
         logger.info(f"Deleted {len(response.data)} rows from {table}")
         return response.data
@@ -145,19 +202,14 @@ def delete_data(table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         raise Exception(f"Delete failed for table {table}: {str(e)}")
 
 
-def count_records(table: str, filters: Optional[Dict[str, Any]] = None) -> int:
+def count_records(table: str, filters: Optional[Dict[str, Any]] = None,
+                  select_fields: str = "*") -> int:
     """Count records in a table with optional filters."""
     try:
-        query = supabase.table(table).select("*", count="exact")
-        if filters:
-            for col, val in filters.items():
-                if isinstance(val, list):
-                    query = query.in_(col, val)
-                else:
-                    query = query.eq(col, val)
+        query = _build_count_query(supabase, table, filters, select_fields)
         response = query.execute()
         count = response.count if response.count is not None else 0
-        logger.info(f"Counted {count} records in {table}")
+        logger.debug(f"Counted {count} records in {table}")
         return count
     except Exception as e:
         logger.error(f"Count failed for table {table}: {str(e)}")
@@ -167,11 +219,12 @@ def count_records(table: str, filters: Optional[Dict[str, Any]] = None) -> int:
 # Advanced Query Functions
 def get_paginated_data(table: str, page: int = 1, per_page: int = 20,
                       filters: Optional[Dict[str, Any]] = None,
-                      select_fields: str = "*", order_by: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+                      select_fields: str = "*", order_by: Optional[str] = None,
+                      count_select_fields: str = "*") -> Tuple[List[Dict[str, Any]], int]:
     """Get paginated data with total count."""
     try:
         # Get total count
-        total = count_records(table, filters)
+        total = count_records(table, filters, select_fields=count_select_fields)
         
         # Calculate offset
         offset = (page - 1) * per_page
@@ -414,16 +467,36 @@ def get_issues_with_details(filters: Optional[Dict[str, Any]] = None,
         raise Exception(f"Get issues with details failed: {str(e)}")
 
 
+def _assignments_query_args(filters: Optional[Dict[str, Any]],
+                            department: Optional[str]) -> Tuple[Dict[str, Any], str, str]:
+    """Build filters, select and count select for the assignments-with-details query."""
+    filters = dict(filters or {})
+    staff_embed = "staff:profiles!staff_id"
+    count_select = "id"
+    if department:
+        staff_embed += "!inner"
+        filters["staff.department"] = department
+        count_select = "id, staff:profiles!staff_id!inner(department)"
+    
+    select_query = f"""
+        *,
+        {staff_embed}(full_name, department),
+        assigned_by_profile:profiles!assigned_by(full_name),
+        issues!issue_id(title, category, status)
+    """
+    return filters, select_query, count_select
+
+
 def get_assignments_with_details(filters: Optional[Dict[str, Any]] = None,
-                                page: int = 1, per_page: int = 20) -> Tuple[List[Dict[str, Any]], int]:
-    """Get assignments with staff and issue details."""
+                                page: int = 1, per_page: int = 20,
+                                department: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Get assignments with staff and issue details.
+
+    When department is given, only assignments whose staff profile belongs to
+    that department are returned (filtered in the database via an inner join).
+    """
     try:
-        select_query = """
-            *,
-            staff:profiles!staff_id(full_name, department),
-            assigned_by_profile:profiles!assigned_by(full_name),
-            issues!issue_id(title, category, status)
-        """
+        filters, select_query, count_select = _assignments_query_args(filters, department)
         
         return get_paginated_data(
             table="issue_assignments",
@@ -431,7 +504,8 @@ def get_assignments_with_details(filters: Optional[Dict[str, Any]] = None,
             per_page=per_page,
             filters=filters,
             select_fields=select_query,
-            order_by="-assigned_at"
+            order_by="-assigned_at",
+            count_select_fields=count_select
         )
     except Exception as e:
         logger.error(f"Get assignments with details failed: {str(e)}")
@@ -610,6 +684,138 @@ def get_issue_trends(days: int = 30) -> Dict[str, List[Dict[str, Any]]]:
         raise Exception(f"Get issue trends failed: {str(e)}")
 
 
+# Async Operations
+# Non-blocking counterparts of the helpers above, for use inside async route handlers.
+async def ainsert_data(table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                       select_fields: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Insert one or more rows into a Supabase table."""
+    try:
+        client = await get_async_supabase()
+        query = _with_select(client.table(table).insert(data), select_fields)
+        response = await query.execute()
+        logger.info(f"Inserted data into {table}: {len(response.data)} rows")
+        return response.data
+    except Exception as e:
+        logger.error(f"Insert failed for table {table}: {str(e)}")
+        raise Exception(f"Insert failed for table {table}: {str(e)}")
+
+
+async def aget_data(table: str, filters: Optional[Dict[str, Any]] = None,
+                    select_fields: str = "*", order_by: Optional[str] = None,
+                    limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Fetch data from a Supabase table with optional filters and pagination."""
+    try:
+        client = await get_async_supabase()
+        query = _build_select_query(client, table, filters, select_fields, order_by, limit, offset)
+        response = await query.execute()
+        logger.debug(f"Fetched {len(response.data)} rows from {table}")
+        return response.data
+    except Exception as e:
+        logger.error(f"Fetch failed for table {table}: {str(e)}")
+        raise Exception(f"Fetch failed for table {table}: {str(e)}")
+
+
+async def aupdate_data(table: str, match: Dict[str, Any], new_data: Dict[str, Any],
+                       select_fields: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Update data in a Supabase table."""
+    try:
+        client = await get_async_supabase()
+        query = _with_select(client.table(table).update(new_data), select_fields)
+        query = _apply_match(query, match)
+        response = await query.execute()
+        logger.info(f"Updated {len(response.data)} rows in {table}")
+        return response.data
+    except Exception as e:
+        logger.error(f"Update failed for table {table}: {str(e)}")
+        raise Exception(f"Update failed for table {table}: {str(e)}")
+
+
+async def adelete_data(table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Delete data from a Supabase table."""
+    try:
+        client = await get_async_supabase()
+        query = _apply_match(client.table(table).delete(), filters)
+        response = await query.execute()
+        logger.info(f"Deleted {len(response.data)} rows from {table}")
+        return response.data
+    except Exception as e:
+        logger.error(f"Delete failed for table {table}: {str(e)}")
+        raise Exception(f"Delete failed for table {table}: {str(e)}")
+
+
+async def acount_records(table: str, filters: Optional[Dict[str, Any]] = None,
+                         select_fields: str = "*") -> int:
+    """Count records in a table with optional filters."""
+    try:
+        client = await get_async_supabase()
+        response = await _build_count_query(client, table, filters, select_fields).execute()
+        count = response.count if response.count is not None else 0
+        logger.debug(f"Counted {count} records in {table}")
+        return count
+    except Exception as e:
+        logger.error(f"Count failed for table {table}: {str(e)}")
+        raise Exception(f"Count failed for table {table}: {str(e)}")
+
+
+async def aget_paginated_data(table: str, page: int = 1, per_page: int = 20,
+                              filters: Optional[Dict[str, Any]] = None,
+                              select_fields: str = "*", order_by: Optional[str] = None,
+                              count_select_fields: str = "*") -> Tuple[List[Dict[str, Any]], int]:
+    """Get paginated data with total count (count and page are fetched concurrently)."""
+    try:
+        offset = (page - 1) * per_page
+        
+        total, data = await asyncio.gather(
+            acount_records(table, filters, select_fields=count_select_fields),
+            aget_data(
+                table=table,
+                filters=filters,
+                select_fields=select_fields,
+                order_by=order_by,
+                limit=per_page,
+                offset=offset
+            )
+        )
+        
+        return data, total
+    except Exception as e:
+        logger.error(f"Paginated fetch failed for table {table}: {str(e)}")
+        raise Exception(f"Paginated fetch failed for table {table}: {str(e)}")
+
+
+async def aget_assignments_with_details(filters: Optional[Dict[str, Any]] = None,
+                                        page: int = 1, per_page: int = 20,
+                                        department: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Get assignments with staff and issue details (see get_assignments_with_details)."""
+    try:
+        filters, select_query, count_select = _assignments_query_args(filters, department)
+        
+        return await aget_paginated_data(
+            table="issue_assignments",
+            page=page,
+            per_page=per_page,
+            filters=filters,
+            select_fields=select_query,
+            order_by="-assigned_at",
+            count_select_fields=count_select
+        )
+    except Exception as e:
+        logger.error(f"Get assignments with details failed: {str(e)}")
+        raise Exception(f"Get assignments with details failed: {str(e)}")
+
+
+async def aexecute_rpc(function_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Execute a Supabase RPC function."""
+    try:
+        client = await get_async_supabase()
+        response = await client.rpc(function_name, params or {}).execute()
+        logger.info(f"Executed RPC function {function_name}")
+        return response.data
+    except Exception as e:
+        logger.error(f"RPC execution failed for {function_name}: {str(e)}")
+        raise Exception(f"RPC execution failed for {function_name}: {str(e)}")
+
+
 # Connection health check
 def health_check() -> bool:
     """Check if Supabase connection is healthy."""
@@ -0,0 +1,21 @@
+-- Mark an issue resolved once none of its assignments are still open.
+-- Called from PUT /api/assignments/{id} after an assignment is completed.
+-- Returns true when the issue was resolved by this call.
+create or replace function public.fn_maybe_resolve_issue(issue_id integer)
+returns boolean
+language sql
+as $$
+  with resolved as (
+    update public.issues i
+    set status = 'resolved'
+    where i.id = fn_maybe_resolve_issue.issue_id
+      and not exists (
+        select 1
+        from public.issue_assignments a
+        where a.issue_id = fn_maybe_resolve_issue.issue_id
+          and a.status <> 'completed'
+      )
+    returning 1
+  )
+  select exists (select 1 from resolved);
+$$;
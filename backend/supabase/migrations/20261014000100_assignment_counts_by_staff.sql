@@ -0,0 +1,13 @@
+-- Assignment counts per (staff member, status) for the given profiles.
+-- Used by the workload and department stats endpoints so they receive a few
+-- integers per user instead of every assignment row.
+create or replace function public.assignment_counts_by_staff(staff_ids uuid[])
+returns table (staff_id uuid, status text, cnt bigint)
+language sql
+stable
+as $$
+  select a.staff_id, a.status::text, count(*) as cnt
+  from public.issue_assignments a
+  where a.staff_id = any(assignment_counts_by_staff.staff_ids)
+  group by a.staff_id, a.status;
+$$;
@@ -0,0 +1,12 @@
+-- Indexes for the assignable-user roster and per-staff assignment status lookups.
+-- Created without CONCURRENTLY because migrations run inside a transaction;
+-- on a large live table, run the concurrent form by hand instead.
+
+-- Rosters: role in ('staff', 'supervisor') [and department = ?]
+create index if not exists idx_profiles_dept_role
+  on public.profiles (department, role)
+  where role in ('staff', 'supervisor');
+
+-- Status counts and active-assignment lookups by staff member
+create index if not exists idx_assignments_staff_status
+  on public.issue_assignments (staff_id, status);